@@ -1,81 +1,229 @@
 import aiohttp
-import ipaddress
 import asyncio
-from typing import List, Optional
-from providers import get_provider
+import logging
+import random
+import time
+from typing import Optional, Sequence, Set, Tuple
+from providers import get_provider_instance
 from ip_sources import IPSourceManager
 
+logger = logging.getLogger(__name__)
+
+# Strong references to running record updates so they are not garbage
+# collected before they finish; the event loop only keeps weak ones
+_background_tasks: Set[asyncio.Task] = set()
+
 class DNSUpdater:
     def __init__(
         self, 
         provider: str, 
         api_key: str, 
         domain: str, 
-        records: list, 
+        records: Sequence[str], 
         session: aiohttp.ClientSession,
         ip_version: int = 4,
-        source_names: Optional[List[str]] = None,
-        exclude_sources: Optional[List[str]] = None,
-        source_timeout: int = 10
+        source_names: Optional[Sequence[str]] = None,
+        exclude_sources: Optional[Sequence[str]] = None,
+        source_timeout: int = 10,
+        source_cache_ttl: float = 900,
+        ip_cache_ttl: float = 0,
+        source_concurrency: int = 0,
+        source_session: Optional[aiohttp.ClientSession] = None,
+        provider_instances: Optional[dict] = None
     ):
-        self.provider = get_provider(provider)(api_key, session)
+        """
+        Initialize DNS updater
+        
+        Args:
+            session: Shared HTTP session used for provider calls, and for IP sources
+                unless source_session is given. Sessions are created once by the
+                caller and must outlive all update cycles; neither the updater nor
+                its IP sources create sessions of their own.
+            ip_cache_ttl: Seconds during which a previously detected IP is confirmed
+                with the best working source alone instead of all sources. 0 disables.
+            source_concurrency: Maximum number of IP sources queried at once, 0 for no limit.
+            source_session: Session for IP source lookups, typically restricted to
+                the address family of ip_version.
+            provider_instances: Provider registry shared with other updaters of the
+                same run, so updaters using one account share a provider instance.
+                Must not outlive session. Defaults to a provider of its own.
+        """
+        self.provider = get_provider_instance(
+            provider, 
+            api_key, 
+            session, 
+            provider_instances if provider_instances is not None else {}
+        )
         self.domain = domain
         self.records = records
         self.session = session
+        self.source_session = source_session or session
         self.ip_version = ip_version
+        self._record_type = 'a' if ip_version == 4 else 'aaaa'
         self.source_timeout = source_timeout
+        self.ip_cache_ttl = ip_cache_ttl
+        self._ip_cache: Optional[Tuple[str, float]] = None
+        # Last IP written to all records, None until the first successful update
+        self.current_ip: Optional[str] = None
+        self._retry_n = 0
+        self._unchanged_count = 0
+        self._pending: Optional[asyncio.Task] = None
+        self._pending_ip: Optional[str] = None
         
         # Initialize IP source manager with selected sources
         self.ip_manager = IPSourceManager(
             source_names=source_names,
-            exclude_sources=exclude_sources
+            exclude_sources=exclude_sources,
+            working_sources_ttl=source_cache_ttl,
+            concurrency=source_concurrency
         )
     
+    def should_log_unchanged(self, heartbeat: int) -> bool:
+        """Count an unchanged check, returning True on every heartbeat-th one"""
+        self._unchanged_count += 1
+        return heartbeat > 0 and self._unchanged_count % heartbeat == 0
+    
+    def reset_unchanged_count(self) -> None:
+        """Restart the heartbeat count after the IP changed"""
+        self._unchanged_count = 0
+    
+    def next_retry_delay(self, max_delay: float) -> float:
+        """Exponential backoff with jitter for the next retry after a failed check"""
+        # Start from the fixed 30 second retry delay used before backing off
+        delay = min(max_delay, 30 * 2 ** self._retry_n) + random.uniform(0, 2)
+        self._retry_n += 1
+        return delay
+    
+    def reset_retry_delay(self) -> None:
+        """Start backing off from the shortest delay again after a successful check"""
+        self._retry_n = 0
+    
+    @property
+    def validation_key(self) -> Tuple[str, str, str]:
+        """Updaters with equal keys validate the same provider account and domain"""
+        return self.provider.validation_cache_key(self.domain)
+    
     async def validate_domain(self) -> None:
         """Validate the domain exists with the provider"""
-        await self.provider.validate_domain(self.domain)
+        await self.provider.validate_domain_cached(self.domain)
     
     async def get_current_ip(self) -> str:
         """Get the current public IP address using selected sources"""
-        # Discover working sources first
-        await self.ip_manager.discover_working_sources(
-            self.session,
-            timeout=self.source_timeout
-        )
+        # While the last full lookup is fresh, a single source agreeing with it is enough
+        if self._ip_cache is not None:
+            cached_ip, fetched_at = self._ip_cache
+            if time.monotonic() - fetched_at < self.ip_cache_ttl:
+                ip = await self.ip_manager.get_ip_from_best_source(
+                    self.source_session,
+                    self.ip_version,
+                    timeout=self.source_timeout
+                )
+                if ip == cached_ip:
+                    return cached_ip
         
-        # Get IP from sources with priority-based selection
+        # Get IP from sources with priority-based selection; working sources
+        # are (re)discovered by the manager once its cached list expires
         ip = await self.ip_manager.get_current_ip(
-            self.session, 
+            self.source_session, 
             self.ip_version,
             timeout=self.source_timeout
         )
         
         if not ip:
+            self._ip_cache = None
             raise ValueError(f"Could not retrieve IPv{self.ip_version} address from any source")
         
+        self._ip_cache = (ip, time.monotonic())
         return ip
     
+    @property
+    def target_ip(self) -> Optional[str]:
+        """IP the records are being updated to, or else the last one written"""
+        if self._pending is not None and not self._pending.done():
+            return self._pending_ip
+        return self.current_ip
+    
+    def schedule_update(self, new_ip: str) -> None:
+        """
+        Update all DNS records with the new IP in a background task
+        
+        The update starts after any update still running for an older IP, so
+        batches never interleave. current_ip is only set once every record has
+        been written; errors are raised by the next call to check_pending_update.
+        """
+        self._pending = asyncio.create_task(self._update_after(self._pending, new_ip))
+        self._pending_ip = new_ip
+        _background_tasks.add(self._pending)
+        self._pending.add_done_callback(_background_tasks.discard)
+    
+    async def _update_after(self, previous: Optional[asyncio.Task], new_ip: str) -> None:
+        """Wait for the previous update, whose outcome is superseded, then write new_ip"""
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        
+        await self.update_dns_records(new_ip)
+        self.current_ip = new_ip
+    
+    def check_pending_update(self) -> None:
+        """Raise the error of the last background update if it has failed"""
+        task = self._pending
+        if task is None or not task.done():
+            return
+        
+        # current_ip still holds the last IP written, so the next check
+        # schedules the update again
+        self._pending = None
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+    
+    async def wait_pending_update(self) -> None:
+        """Wait for a running background update to finish"""
+        if self._pending is not None:
+            await asyncio.gather(self._pending, return_exceptions=True)
+    
     async def update_dns_records(self, new_ip: str) -> None:
-        """Update all DNS records with the new IP"""
-        # Determine record type based on IP version
-        ip_version = ipaddress.ip_address(new_ip).version
-        record_type = 'a' if ip_version == 4 else 'aaaa'
+        """
+        Update all DNS records with the new IP
+        
+        Raises:
+            Errors from the provider that prevent the whole batch, like failing
+            to list the existing records. After logging the per-record errors,
+            an authentication error (401/403) is raised as is; any other failed
+            record raises a RuntimeError, which the caller retries later.
+        """
+        # Record type follows the IP version this updater was created for; a
+        # single ':' test is enough to reject an address of the other family
+        record_type = self._record_type
+        if (':' in new_ip) != (record_type == 'aaaa'):
+            raise ValueError(f"{new_ip} is not an IPv{self.ip_version} address")
         
-        # Update records concurrently
-        tasks = []
-        for record in self.records:
-            task = self.provider.update_dns_record(
-                domain=self.domain,
-                record=record,
-                record_type=record_type,
-                new_ip=new_ip
-            )
-            tasks.append(task)
+        # Update records concurrently; the provider batches the requests
+        results = await self.provider.update_dns_records(
+            domain=self.domain,
+            records=self.records,
+            record_type=record_type,
+            new_ip=new_ip
+        )
         
-        # Run all updates concurrently with timeout
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Confirm the new IP with all sources on the next check
+        self._ip_cache = None
         
         # Log any errors
+        errors = []
         for record, result in zip(self.records, results):
-            if isinstance(result, Exception):
-                print(f"Error updating record {record}: {result}")
\ No newline at end of file
+            if isinstance(result, aiohttp.ClientResponseError):
+                logger.error(f"Failed to update record {record}: {result.status} {result.message}")
+            elif isinstance(result, asyncio.TimeoutError):
+                logger.error(f"Timeout updating record {record}")
+            elif isinstance(result, Exception):
+                logger.error(f"Error updating record {record}: {result}")
+            else:
+                continue
+            errors.append(result)
+        
+        for error in errors:
+            if isinstance(error, aiohttp.ClientResponseError) and error.status in (401, 403):
+                raise error
+        
+        if errors:
+            raise RuntimeError(f"{len(errors)} of {len(self.records)} records were not updated")
\ No newline at end of file
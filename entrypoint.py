@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 import sys
-import subprocess
 
 def parse_env_list(env_var_name: str, default: str = '') -> str:
     """Parse environment variable list, converting empty string to default"""
@@ -25,9 +24,8 @@ def main():
         print(f"Error: Missing required environment variables: {', '.join(missing)}")
         sys.exit(1)
     
-    # Build command
+    # Build command-line arguments for main.py
     cmd = [
-        "python", "main.py",
         "--provider", required_params['PROVIDER'],
         "--key", required_params['API_KEY'],
         "--domain", required_params['DOMAIN'],
@@ -53,6 +51,15 @@ def main():
     if source_timeout := os.getenv('SOURCE_TIMEOUT'):
         cmd.extend(['--source-timeout', source_timeout])
     
+    if source_cache_ttl := os.getenv('SOURCE_CACHE_TTL'):
+        cmd.extend(['--source-cache-ttl', source_cache_ttl])
+    
+    if source_concurrency := os.getenv('SOURCE_CONCURRENCY'):
+        cmd.extend(['--source-concurrency', source_concurrency])
+    
+    if ip_cache_ttl := os.getenv('IP_CACHE_TTL'):
+        cmd.extend(['--ip-cache-ttl', ip_cache_ttl])
+    
     # Timing configuration
     if interval := os.getenv('INTERVAL'):
         cmd.extend(['--interval', interval])
@@ -60,6 +67,9 @@ def main():
     if timeout := os.getenv('TIMEOUT'):
         cmd.extend(['--timeout', timeout])
     
+    if log_heartbeat := os.getenv('LOG_HEARTBEAT'):
+        cmd.extend(['--log-heartbeat', log_heartbeat])
+    
     # Mode flags
     if os.getenv('VALIDATE_ONLY', 'false').lower() in ('true', '1', 'yes'):
         cmd.append('--validate-only')
@@ -67,14 +77,10 @@ def main():
     if os.getenv('LIST_SOURCES', 'false').lower() in ('true', '1', 'yes'):
         cmd.append('--list-sources')
     
-    # Execute command
+    # Execute command in-process instead of spawning a second interpreter
     try:
-        result = subprocess.run(cmd, check=True)
-        sys.exit(result.returncode)
-    except subprocess.CalledProcessError as e:
-        print(f"Command failed with exit code {e.returncode}")
-        print(f"Command: {' '.join(cmd)}")
-        sys.exit(e.returncode)
+        import main as app
+        sys.exit(app.run(cmd))
     except KeyboardInterrupt:
         print("\nProcess interrupted by user")
         sys.exit(130)
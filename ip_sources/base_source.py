@@ -1,7 +1,65 @@
 import aiohttp
+import asyncio
+import functools
 import ipaddress
+import re
+import socket
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import Awaitable, Callable, Optional, Dict
+
+# Upper bound on how much of an HTML page is read while looking for the IP
+_MAX_HTML_BYTES = 256 * 1024
+
+# Whole-string shape checks used to reject non-addresses cheaply
+_IPV4_FULL_RE = re.compile(r'[0-9]{1,3}(?:\.[0-9]{1,3}){3}')
+_IPV6_FULL_RE = re.compile(r'[0-9A-Fa-f:.]+')
+
+def _timeout(t: float) -> aiohttp.ClientTimeout:
+    """Build a request timeout that separates connecting from reading"""
+    return aiohttp.ClientTimeout(total=t, connect=min(5, t), sock_connect=min(5, t), sock_read=t)
+
+# Longest textual IP address (IPv6 with an embedded IPv4 part)
+_MAX_IP_LENGTH = 45
+
+def _is_valid_ip(s: str, version: int) -> bool:
+    """
+    Validate an IP address string for the given version
+    
+    Strings too long to be an address are rejected before the cached check,
+    so a misbehaving source cannot fill the cache with large response bodies.
+    """
+    return len(s) <= _MAX_IP_LENGTH and _check_ip(s, version)
+
+@functools.lru_cache(maxsize=64)
+def _check_ip(s: str, version: int) -> bool:
+    """
+    Check the shape and value of a short candidate address
+    
+    A precompiled pattern rejects obvious garbage before the C socket parser
+    confirms the address. Results are cached because sources keep reporting
+    the same address cycle after cycle.
+    """
+    if version == 4:
+        pattern, family = _IPV4_FULL_RE, socket.AF_INET
+    else:
+        pattern, family = _IPV6_FULL_RE, socket.AF_INET6
+    
+    if not pattern.fullmatch(s):
+        return False
+    
+    try:
+        socket.inet_pton(family, s)
+        return True
+    except (OSError, ValueError):
+        return False
+
+def _is_valid_ipv4(s: str) -> bool:
+    """Validate a dotted-quad IPv4 address"""
+    return _is_valid_ip(s, 4)
+
+def _is_valid_ipv6(s: str) -> bool:
+    """Validate an IPv6 address"""
+    return _is_valid_ip(s, 6)
 
 class IPSource(ABC):
     """Base class for IP detection sources"""
@@ -18,43 +76,113 @@ class IPSource(ABC):
         pass
     
     @abstractmethod
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
         """
         Retrieve IP addresses from this source
         
+        Args:
+            ip_version: 4 or 6 to only look up that version, None for both
+        
         Returns:
             Dict with keys 'ipv4' and/or 'ipv6', values are IP strings or None
         """
         pass
     
-    def _extract_ip_from_response(self, text: str, version: int) -> Optional[str]:
-        """Helper to extract and validate IP from text response"""
+    async def probe_and_fetch(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Retrieve IP addresses and update the working state in a single request
+        
+        Returns:
+            Same as get_ips; the source is considered working if any IP was returned
+        """
+        results = await self.get_ips(session, ip_version)
+        self.is_working = any(results.values())
+        return results
+    
+    async def _fetch_by_version(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int], 
+        fetch: Callable[[aiohttp.ClientSession, str, int], Awaitable[Optional[str]]], 
+        urls: Dict[int, str]
+    ) -> Dict[str, Optional[str]]:
+        """Concurrently fetch the requested IP version(s), one URL per version"""
+        versions = [version for version in (4, 6) if ip_version in (None, version)]
+        ips = await asyncio.gather(*(fetch(session, urls[version], version) for version in versions))
+        
+        results = {'ipv4': None, 'ipv6': None}
+        for version, ip in zip(versions, ips):
+            results[f'ipv{version}'] = ip
+        return results
+    
+    async def _fetch_plain_ip(
+        self, 
+        session: aiohttp.ClientSession, 
+        url: str, 
+        version: int
+    ) -> Optional[str]:
+        """Fetch a URL whose response body is just the IP address"""
+        try:
+            async with session.get(url, timeout=_timeout(self.timeout)) as response:
+                if response.status == 200:
+                    return self._parse_plain_ip(await response.text(), version)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            pass
+        
+        return None
+    
+    async def _read_until_match(
+        self, 
+        response: aiohttp.ClientResponse, 
+        *patterns: re.Pattern, 
+        limit: int = _MAX_HTML_BYTES, 
+        overlap: int = 1024
+    ) -> bytes:
+        """
+        Read the body in chunks until any bytes pattern matches or the limit is reached
+        
+        Each new chunk is searched together with the last overlap bytes before
+        it, which must cover the longest expected match. A longer match is not
+        lost, reading just continues to the limit or the end of the body.
+        
+        After a match the rest of the body, up to the limit, is read and
+        discarded without searching it. A fully read response lets aiohttp
+        return the connection to the keep-alive pool instead of closing it,
+        which costs less than a new TCP and TLS handshake on the next request.
+        """
+        buf = bytearray()
+        async for chunk in response.content.iter_chunked(4096):
+            start = max(0, len(buf) - overlap)
+            buf.extend(chunk)
+            if len(buf) >= limit or any(pattern.search(buf, start) for pattern in patterns):
+                break
+        
+        # Drain the remaining body so the connection can be reused
+        received = len(buf)
+        while received < limit:
+            chunk = await response.content.read(16 * 1024)
+            if not chunk:
+                break
+            received += len(chunk)
+        
+        return bytes(buf)
+    
+    def _parse_plain_ip(self, text: str, version: int) -> Optional[str]:
+        """Helper to validate a response whose body is just the IP address"""
         if not text:
             return None
         
-        # Clean the response
         text = text.strip()
+        if not _is_valid_ip(text, version):
+            return None
         
-        # Try to parse as IP
-        try:
-            ip = ipaddress.ip_address(text)
-            if ip.version == version:
-                return str(ip)
-        except ValueError:
-            # Try to find IP in text (some services return HTML or JSON)
-            import re
-            if version == 4:
-                pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-            else:
-                pattern = r'\b(?:[A-Fa-f0-9]{1,4}:){7}[A-Fa-f0-9]{1,4}\b'
-            
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    ip = ipaddress.ip_address(match)
-                    if ip.version == version:
-                        return str(ip)
-                except ValueError:
-                    continue
-        
-        return None
\ No newline at end of file
+        # Normalize IPv6 to the compressed form; IPv4 is already canonical
+        return text if version == 4 else str(ipaddress.IPv6Address(text))
\ No newline at end of file
@@ -1,6 +1,12 @@
 import aiohttp
+import async_timeout
 import asyncio
-from typing import List, Dict, Optional, Tuple
+import contextlib
+import math
+import operator
+import sys
+import time
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Optional, Set, Tuple
 import logging
 
 from ip_sources.base_source import IPSource
@@ -8,13 +14,52 @@ from .sources import SOURCES_REGISTRY  # We'll create this registry
 
 logger = logging.getLogger(__name__)
 
+@contextlib.asynccontextmanager
+async def _cancelling_task_group() -> AsyncIterator[Callable[[Awaitable], asyncio.Task]]:
+    """
+    Yield a create_task function whose tasks are cancelled and awaited on exit
+    
+    Uses asyncio.TaskGroup where available (Python 3.11+) so leftover tasks are
+    always reaped, even when the body returns early or is itself cancelled.
+    """
+    tasks: List[asyncio.Task] = []
+    
+    if sys.version_info >= (3, 11):
+        async with asyncio.TaskGroup() as tg:
+            def create_task(coro: Awaitable) -> asyncio.Task:
+                task = tg.create_task(coro)
+                tasks.append(task)
+                return task
+            
+            try:
+                yield create_task
+            finally:
+                for task in tasks:
+                    task.cancel()
+    else:
+        def create_task(coro: Awaitable) -> asyncio.Task:
+            task = asyncio.ensure_future(coro)
+            tasks.append(task)
+            return task
+        
+        try:
+            yield create_task
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 class IPSourceManager:
     """Manages multiple IP detection sources with priority-based selection"""
     
     def __init__(
         self, 
         source_names: Optional[List[str]] = None,
-        exclude_sources: Optional[List[str]] = None
+        exclude_sources: Optional[List[str]] = None,
+        working_sources_ttl: float = 900,
+        first_response_priority: int = 1,
+        agreement_quorum: int = 2,
+        concurrency: int = 0
     ):
         """
         Initialize IP source manager
@@ -22,15 +67,42 @@ class IPSourceManager:
         Args:
             source_names: List of source names to include. If None or empty, include all.
             exclude_sources: List of source names to exclude.
+            working_sources_ttl: Seconds to reuse discovered working sources before pinging again.
+            first_response_priority: Accept the first IP returned by a source with this
+                priority or better without waiting for the remaining sources.
+            agreement_quorum: Accept an IP as soon as this many sources agree on it.
+            concurrency: Maximum number of sources queried at once, 0 for no limit.
+                Requests to a single host are additionally bounded by the
+                session connector's limit_per_host.
         """
-        self.all_sources = self._initialize_all_sources()
-        self.sources = self._filter_sources(source_names, exclude_sources)
+        include_set = {name.lower() for name in source_names} if source_names else None
+        exclude_set = {name.lower() for name in exclude_sources} if exclude_sources else set()
+        
+        self.sources = self._initialize_all_sources(include_set, exclude_set)
+        # Keep sources ordered by priority (lower number = higher priority) so
+        # any subset taken in order, like the working sources, is sorted too
+        self.sources.sort(key=operator.attrgetter('priority'))
         self.working_sources: List[IPSource] = []
+        self._working_sources_ttl = working_sources_ttl
+        self._working_sources_expiry = 0.0
+        self.first_response_priority = first_response_priority
+        self.agreement_quorum = agreement_quorum
+        self._concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
     
-    def _initialize_all_sources(self) -> List[IPSource]:
-        """Initialize all available IP sources from registry"""
+    def _initialize_all_sources(
+        self, 
+        include_set: Optional[Set[str]], 
+        exclude_set: Set[str]
+    ) -> List[IPSource]:
+        """Initialize the selected IP sources from registry (registry keys are lower-case)"""
         sources = []
         for name, source_class in SOURCES_REGISTRY.items():
+            if include_set is not None and name not in include_set:
+                continue
+            if name in exclude_set:
+                continue
+            
             try:
                 source = source_class()
                 sources.append(source)
@@ -38,34 +110,6 @@ class IPSourceManager:
                 logger.warning(f"Failed to initialize source {name}: {e}")
         return sources
     
-    def _filter_sources(
-        self, 
-        include_names: Optional[List[str]], 
-        exclude_names: Optional[List[str]]
-    ) -> List[IPSource]:
-        """Filter sources based on include/exclude lists"""
-        filtered_sources = []
-        
-        # Start with all sources if no include list is provided
-        if not include_names:
-            filtered_sources = self.all_sources.copy()
-        else:
-            # Include only specified sources
-            include_set = set(name.lower() for name in include_names)
-            for source in self.all_sources:
-                if source.name.lower() in include_set:
-                    filtered_sources.append(source)
-        
-        # Apply exclude filter
-        if exclude_names:
-            exclude_set = set(name.lower() for name in exclude_names)
-            filtered_sources = [
-                source for source in filtered_sources 
-                if source.name.lower() not in exclude_set
-            ]
-        
-        return filtered_sources
-    
     async def discover_working_sources(
         self, 
         session: aiohttp.ClientSession, 
@@ -90,11 +134,23 @@ class IPSourceManager:
             else:
                 logger.warning(f"Source {source.name} is not reachable")
         
-        # Sort by priority (lower number = higher priority)
-        self.working_sources.sort(key=lambda x: x.priority)
+        self._set_working_sources(self.working_sources)
+        return working_names
+    
+    def _set_working_sources(self, working_sources: List[IPSource]) -> None:
+        """Store the working sources (already in priority order) and restart the cache TTL"""
+        self.working_sources = working_sources
+        
+        self._working_sources_expiry = time.monotonic() + self._working_sources_ttl
         
         logger.info(f"Found {len(self.working_sources)} working sources")
-        return working_names
+    
+    def invalidate_working_sources(self) -> None:
+        """Force source discovery on the next IP lookup"""
+        self._working_sources_expiry = 0.0
+    
+    def _working_sources_expired(self) -> bool:
+        return not self.working_sources or time.monotonic() >= self._working_sources_expiry
     
     async def get_current_ip(
         self, 
@@ -105,77 +161,173 @@ class IPSourceManager:
         """
         Get current IP using all working sources, with priority-based selection
         
+        Each source is queried with a single request: a source counts as working
+        when it returns an address for the requested IP version. Working sources
+        are rediscovered only when the cached list has expired.
+        
         Args:
             ip_version: 4 for IPv4, 6 for IPv6
             
         Returns:
             Selected IP address or None if no sources could provide it
         """
-        if not self.working_sources:
-            await self.discover_working_sources(session)
+        # When the cached list has expired every configured source is queried,
+        # and the sources that return an IP become the new working list
+        discovering = self._working_sources_expired()
         
-        if not self.working_sources:
+        if discovering:
+            for source in self.sources:
+                source.timeout = timeout
+            sources = self.sources
+        else:
+            sources = self.working_sources
+        
+        if not sources:
             logger.error("No working IP sources available")
             return None
         
-        # Get IPs from all working sources concurrently
-        tasks = [source.get_ips(session) for source in self.working_sources]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        key = 'ipv4' if ip_version == 4 else 'ipv6'
         
-        # Collect IPs by priority
-        ip_candidates = []
+        responded: Set[IPSource] = set()
+        # Sources that have not answered or failed yet
+        pending: Set[IPSource] = set(sources)
+        # Best (lowest) source priority and number of sources seen for each distinct IP
+        best_priority: Dict[str, int] = {}
+        votes: Dict[str, int] = {}
         
-        for source, result in zip(self.working_sources, results):
-            if isinstance(result, Exception):
-                logger.warning(f"Source {source.name} failed: {result}")
-                continue
-            
-            key = 'ipv4' if ip_version == 4 else 'ipv6'
-            ip = result.get(key)
+        # Each source gets the full timeout once it may run; with a concurrency
+        # limit, sources run in batches and the overall deadline covers them all
+        deadline = timeout
+        if self._semaphore is not None:
+            deadline = timeout * math.ceil(len(sources) / self._concurrency)
+        
+        # Query sources concurrently and handle results as they arrive; sources
+        # still running when this block exits are cancelled so they release
+        # their connections
+        async with _cancelling_task_group() as create_task:
+            tasks = [
+                create_task(self._query_source(source, session, ip_version, timeout))
+                for source in sources
+            ]
             
-            if ip:
-                ip_candidates.append({
-                    'ip': ip,
-                    'source': source.name,
-                    'priority': source.priority
-                })
-                logger.debug(f"Source {source.name} returned {key}: {ip}")
-        
-        if not ip_candidates:
+            try:
+                async with async_timeout.timeout(deadline):
+                    for next_result in asyncio.as_completed(tasks):
+                        source, result = await next_result
+                        pending.discard(source)
+                        
+                        if isinstance(result, Exception):
+                            logger.warning(f"Source {source.name} failed: {result}")
+                            self.invalidate_working_sources()
+                        elif not result.get(key):
+                            if not discovering:
+                                logger.warning(f"Source {source.name} returned no {key} address")
+                                self.invalidate_working_sources()
+                        else:
+                            ip = result[key]
+                            responded.add(source)
+                            best_priority[ip] = min(best_priority.get(ip, source.priority), source.priority)
+                            votes[ip] = votes.get(ip, 0) + 1
+                            logger.debug(f"Source {source.name} returned {key}: {ip}")
+                        
+                        # While discovering, all sources are awaited to rebuild the
+                        # working list
+                        if discovering or not best_priority:
+                            continue
+                        
+                        # A trusted source answered or enough sources agree, no need to
+                        # wait for the rest. Only the IP the priority rule below would
+                        # select is accepted, and only once no source with a better
+                        # priority is still running, so stopping early never picks a
+                        # different IP than waiting for every source would.
+                        ip = min(best_priority, key=best_priority.get)
+                        if any(other.priority < best_priority[ip] for other in pending):
+                            continue
+                        if best_priority[ip] <= self.first_response_priority:
+                            logger.info(f"Using IP {ip} from a priority {best_priority[ip]} source")
+                            return ip
+                        if votes[ip] >= self.agreement_quorum:
+                            logger.info(f"Using IP {ip} reported by {votes[ip]} sources")
+                            return ip
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out after {deadline}s waiting for IP sources")
+        
+        if discovering:
+            self._set_working_sources([source for source in sources if source in responded])
+        
+        if not best_priority:
             logger.error(f"No sources could provide IPv{ip_version} address")
+            self.invalidate_working_sources()
             return None
         
-        # Group IPs by value
-        ip_groups = {}
-        for candidate in ip_candidates:
-            ip = candidate['ip']
-            if ip not in ip_groups:
-                ip_groups[ip] = []
-            ip_groups[ip].append(candidate)
-        
-        # Find the most common IP
-        if len(ip_groups) == 1:
+        if len(best_priority) == 1:
             # All sources agree
-            selected_ip = list(ip_groups.keys())[0]
+            selected_ip = next(iter(best_priority))
             logger.info(f"All sources agree on IP: {selected_ip}")
             return selected_ip
         
-        # Sources disagree - use priority-based selection
-        logger.warning(f"Sources disagree on IPs: {list(ip_groups.keys())}")
-        
-        # For each IP, get the highest priority source that reported it
-        ip_priority = {}
-        for ip, candidates in ip_groups.items():
-            # Get the highest priority (lowest number) for this IP
-            highest_priority = min(c['priority'] for c in candidates)
-            ip_priority[ip] = highest_priority
-        
-        # Select IP with highest priority (lowest number)
-        selected_ip = min(ip_priority.items(), key=lambda x: x[1])[0]
+        # Sources disagree - select the IP reported by the highest priority
+        # (lowest number) source
+        logger.warning(f"Sources disagree on IPs: {list(best_priority)}")
+        selected_ip = min(best_priority, key=best_priority.get)
         
         logger.info(f"Selected IP {selected_ip} based on priority")
         return selected_ip
     
+    async def get_ip_from_best_source(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: int = 4,
+        timeout: int = 10
+    ) -> Optional[str]:
+        """
+        Get IP from the highest priority working source only
+        
+        Returns:
+            The IP reported by that source, or None if the working-source cache
+            has expired or the source did not return an address
+        """
+        if self._working_sources_expired():
+            return None
+        
+        source = self.working_sources[0]
+        try:
+            async with async_timeout.timeout(timeout):
+                _, result = await self._query_source(source, session, ip_version, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Source {source.name} timed out after {timeout}s")
+            return None
+        
+        if isinstance(result, Exception):
+            logger.warning(f"Source {source.name} failed: {result}")
+            return None
+        
+        return result.get('ipv4' if ip_version == 4 else 'ipv6')
+    
+    async def _query_source(
+        self, 
+        source: IPSource, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None, 
+        timeout: float = 10
+    ) -> Tuple[IPSource, object]:
+        """
+        Get IPs from a single source, returning the source with its result or error
+        
+        The timeout starts once the source may run, so time spent waiting for
+        a concurrency slot does not count against it.
+        """
+        try:
+            if self._semaphore is None:
+                async with async_timeout.timeout(timeout):
+                    return source, await source.probe_and_fetch(session, ip_version)
+            
+            async with self._semaphore:
+                async with async_timeout.timeout(timeout):
+                    return source, await source.probe_and_fetch(session, ip_version)
+        except Exception as e:
+            return source, e
+    
     async def get_all_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
         """Get both IPv4 and IPv6 addresses"""
         if not self.working_sources:
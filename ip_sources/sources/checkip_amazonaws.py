@@ -1,6 +1,7 @@
 from typing import Dict, Optional
 import aiohttp
-from ..base_source import IPSource
+import asyncio
+from ..base_source import IPSource, _timeout
 
 class CheckIPAmazonAWSSource(IPSource):
     """Source using checkip.amazonaws.com service"""
@@ -10,22 +11,30 @@ class CheckIPAmazonAWSSource(IPSource):
     
     async def ping(self, session: aiohttp.ClientSession) -> bool:
         try:
-            async with session.get("https://checkip.amazonaws.com", timeout=self.timeout) as response:
+            async with session.get("https://checkip.amazonaws.com", timeout=_timeout(self.timeout)) as response:
                 self.is_working = response.status == 200
                 return self.is_working
-        except:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             self.is_working = False
             return False
     
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
         results = {'ipv4': None, 'ipv6': None}
         
+        # checkip.amazonaws.com only reports IPv4
+        if ip_version == 6:
+            return results
+        
         try:
-            async with session.get("https://checkip.amazonaws.com", timeout=self.timeout) as response:
+            async with session.get("https://checkip.amazonaws.com", timeout=_timeout(self.timeout)) as response:
                 if response.status == 200:
                     text = await response.text()
-                    results['ipv4'] = self._extract_ip_from_response(text, 4)
-        except:
+                    results['ipv4'] = self._parse_plain_ip(text, 4)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             pass
         
         return results
\ No newline at end of file
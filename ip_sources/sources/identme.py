@@ -1,6 +1,7 @@
 from typing import Dict, Optional
 import aiohttp
-from ..base_source import IPSource
+import asyncio
+from ..base_source import IPSource, _timeout
 
 class IdentMeSource(IPSource):
     """Source using ident.me service"""
@@ -10,30 +11,20 @@ class IdentMeSource(IPSource):
     
     async def ping(self, session: aiohttp.ClientSession) -> bool:
         try:
-            async with session.get("https://v4.ident.me", timeout=self.timeout) as response:
+            async with session.get("https://v4.ident.me", timeout=_timeout(self.timeout)) as response:
                 self.is_working = response.status == 200
                 return self.is_working
-        except:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             self.is_working = False
             return False
     
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
-        results = {'ipv4': None, 'ipv6': None}
-        
-        try:
-            # IPv4
-            async with session.get("https://v4.ident.me", timeout=self.timeout) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    results['ipv4'] = self._extract_ip_from_response(text, 4)
-            
-            # IPv6
-            async with session.get("https://v6.ident.me", timeout=self.timeout) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    results['ipv6'] = self._extract_ip_from_response(text, 6)
-                    
-        except:
-            pass
-        
-        return results
\ No newline at end of file
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
+        # Query the requested endpoints concurrently
+        return await self._fetch_by_version(session, ip_version, self._fetch_plain_ip, {
+            4: "https://v4.ident.me",
+            6: "https://v6.ident.me"
+        })
\ No newline at end of file
@@ -1,7 +1,8 @@
 from typing import Dict, Optional
 import aiohttp
+import asyncio
 import json
-from ..base_source import IPSource
+from ..base_source import IPSource, _timeout
 
 class IpifySource(IPSource):
     """Source using ipify.org API"""
@@ -11,30 +12,31 @@ class IpifySource(IPSource):
     
     async def ping(self, session: aiohttp.ClientSession) -> bool:
         try:
-            async with session.get("https://api.ipify.org?format=json", timeout=self.timeout) as response:
+            async with session.get("https://api.ipify.org?format=json", timeout=_timeout(self.timeout)) as response:
                 self.is_working = response.status == 200
                 return self.is_working
-        except:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             self.is_working = False
             return False
     
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
-        results = {'ipv4': None, 'ipv6': None}
-        
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
+        # Query the requested endpoints concurrently
+        return await self._fetch_by_version(session, ip_version, self._fetch_ip, {
+            4: "https://api.ipify.org?format=json",
+            6: "https://api6.ipify.org?format=json"
+        })
+    
+    async def _fetch_ip(self, session: aiohttp.ClientSession, url: str, version: int) -> Optional[str]:
         try:
-            # IPv4
-            async with session.get("https://api.ipify.org?format=json", timeout=self.timeout) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results['ipv4'] = self._extract_ip_from_response(data.get('ip', ''), 4)
-            
-            # IPv6
-            async with session.get("https://api6.ipify.org?format=json", timeout=self.timeout) as response:
+            async with session.get(url, timeout=_timeout(self.timeout)) as response:
                 if response.status == 200:
                     data = await response.json()
-                    results['ipv6'] = self._extract_ip_from_response(data.get('ip', ''), 6)
-                    
-        except:
+                    return self._parse_plain_ip(data.get('ip', ''), version)
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
             pass
         
-        return results
\ No newline at end of file
+        return None
\ No newline at end of file
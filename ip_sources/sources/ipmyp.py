@@ -1,8 +1,13 @@
 from typing import Dict, Optional
 import aiohttp
+import asyncio
 import re
 import json
-from ..base_source import IPSource
+from ..base_source import IPSource, _timeout, _is_valid_ipv4, _is_valid_ipv6
+
+_ROOT_RE = re.compile(rb'<div[^>]*id="ipvj-lite-root"[^>]*>', re.IGNORECASE)
+_AJAX_URL_RE = re.compile(rb'data-ajax="([^"]+)"')
+_NONCE_RE = re.compile(rb'data-nonce="([^"]+)"')
 
 class IPMypSource(IPSource):
     """Source using ipmyp.ir service with AJAX request"""
@@ -12,40 +17,47 @@ class IPMypSource(IPSource):
     
     async def ping(self, session: aiohttp.ClientSession) -> bool:
         try:
-            async with session.get("https://ipmyp.ir", timeout=self.timeout) as response:
+            async with session.get("https://ipmyp.ir", timeout=_timeout(self.timeout)) as response:
                 self.is_working = response.status == 200
                 return self.is_working
-        except:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             self.is_working = False
             return False
     
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
         results = {'ipv4': None, 'ipv6': None}
         
+        # ipmyp.ir only reports IPv4
+        if ip_version == 6:
+            return results
+        
         try:
             # Step 1: Get the initial page
-            async with session.get("https://ipmyp.ir", timeout=self.timeout) as response:
+            async with session.get("https://ipmyp.ir", timeout=_timeout(self.timeout)) as response:
                 if response.status != 200:
                     return results
                 
-                html = await response.text()
+                html = await self._read_until_match(response, _ROOT_RE)
                 
                 # Find the root element first
-                root_pattern = r'<div[^>]*id="ipvj-lite-root"[^>]*>'
-                root_match = re.search(root_pattern, html, re.IGNORECASE)
+                root_match = _ROOT_RE.search(html)
                 
                 if not root_match:
                     return results
                 
                 # Extract data-ajax and data-nonce attributes (order independent)
-                ajax_url_match = re.search(r'data-ajax="([^"]+)"', root_match.group(0))
-                nonce_match = re.search(r'data-nonce="([^"]+)"', root_match.group(0))
+                ajax_url_match = _AJAX_URL_RE.search(root_match.group(0))
+                nonce_match = _NONCE_RE.search(root_match.group(0))
                 
                 if not ajax_url_match or not nonce_match:
                     return results
                 
-                ajax_url = ajax_url_match.group(1)
-                nonce = nonce_match.group(1)
+                ajax_url = ajax_url_match.group(1).decode('utf-8')
+                nonce = nonce_match.group(1).decode('utf-8')
             
             # Step 2: Make the AJAX request
             form_data = aiohttp.FormData()
@@ -61,7 +73,7 @@ class IPMypSource(IPSource):
                     'Referer': 'https://ipmyp.ir/',
                     'Origin': 'https://ipmyp.ir'
                 },
-                timeout=self.timeout
+                timeout=_timeout(self.timeout)
             ) as ajax_response:
                 if ajax_response.status != 200:
                     return results
@@ -73,16 +85,13 @@ class IPMypSource(IPSource):
                     if ip and self._validate_ip(ip, 4):
                         results['ipv4'] = ip
             
-        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError):
             pass
-        except Exception as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             pass
         
         return results
     
     def _validate_ip(self, ip: str, version: int) -> bool:
         """Helper method to validate IP format"""
-        try:
-            return bool(self._extract_ip_from_response(ip, version))
-        except:
-            return False
\ No newline at end of file
+        return _is_valid_ipv4(ip) if version == 4 else _is_valid_ipv6(ip)
\ No newline at end of file
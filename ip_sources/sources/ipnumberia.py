@@ -1,7 +1,14 @@
 from typing import Dict, Optional
 import aiohttp
+import asyncio
 import re
-from ..base_source import IPSource
+from ..base_source import IPSource, _timeout, _is_valid_ipv4, _is_valid_ipv6
+
+# Pattern 1: <div class="ip">89.219.90.11</div>
+_IP_DIV_RE = re.compile(rb'<div\s+class="ip">([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})</div>')
+
+# Pattern 2: In the table cell <td>89.219.90.11</td>
+_IP_TD_RE = re.compile(rb'<td>([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})</td>')
 
 class IPNumberiaSource(IPSource):
     """Source using ipnumberia.com service"""
@@ -11,55 +18,47 @@ class IPNumberiaSource(IPSource):
     
     async def ping(self, session: aiohttp.ClientSession) -> bool:
         try:
-            async with session.get("https://ipnumberia.com", timeout=self.timeout) as response:
+            async with session.get("https://ipnumberia.com", timeout=_timeout(self.timeout)) as response:
                 self.is_working = response.status == 200
                 return self.is_working
-        except:
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
             self.is_working = False
             return False
     
-    async def get_ips(self, session: aiohttp.ClientSession) -> Dict[str, Optional[str]]:
+    async def get_ips(
+        self, 
+        session: aiohttp.ClientSession, 
+        ip_version: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
         results = {'ipv4': None, 'ipv6': None}
         
+        # ipnumberia.com only reports IPv4
+        if ip_version == 6:
+            return results
+        
         try:
-            async with session.get("https://ipnumberia.com", timeout=self.timeout) as response:
+            async with session.get("https://ipnumberia.com", timeout=_timeout(self.timeout)) as response:
                 if response.status == 200:
-                    html = await response.text()
-                    
-                    # Extract IP using regex - looking for both patterns in the HTML
-                    # Pattern 1: <div class="ip">89.219.90.11</div>
-                    ip_pattern1 = r'<div\s+class="ip">([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})</div>'
+                    # Only the preferred pattern ends the read early, so a table
+                    # cell earlier in the page does not hide the div
+                    html = await self._read_until_match(response, _IP_DIV_RE)
                     
-                    # Pattern 2: In the table cell <td>89.219.90.11</td>
-                    ip_pattern2 = r'<td>([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})</td>'
-                    
-                    # Try pattern 1 first (more specific)
-                    match1 = re.search(ip_pattern1, html)
-                    if match1:
-                        ip = match1.group(1)
-                        if self._validate_ip(ip, 4):
-                            results['ipv4'] = ip
-                    
-                    # If pattern 1 didn't work, try pattern 2
-                    if not results['ipv4']:
-                        match2 = re.search(ip_pattern2, html)
-                        if match2:
-                            ip = match2.group(1)
+                    # Extract IP using regex - try pattern 1 first (more specific),
+                    # then fall back to pattern 2
+                    for pattern in (_IP_DIV_RE, _IP_TD_RE):
+                        match = pattern.search(html)
+                        if match:
+                            ip = match.group(1).decode('ascii')
                             if self._validate_ip(ip, 4):
                                 results['ipv4'] = ip
+                                break
                     
-                    # Note: ipnumberia.com only shows IPv4
-                    
-        except Exception as e:
-            # Log the error but don't crash
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            # Network errors mean no IP from this source; don't crash
             pass
         
         return results
     
     def _validate_ip(self, ip: str, version: int) -> bool:
         """Helper method to validate IP format"""
-        try:
-            # Use the parent class method
-            return bool(self._extract_ip_from_response(ip, version))
-        except:
-            return False
\ No newline at end of file
+        return _is_valid_ipv4(ip) if version == 4 else _is_valid_ipv6(ip)
\ No newline at end of file
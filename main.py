@@ -1,10 +1,28 @@
 import argparse
 import asyncio
+import contextlib
+import json
 import socket
+import sys
+import time
 import aiohttp
 import logging
-from typing import List
-from dns_updater import DNSUpdater
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; request bodies are then encoded with the json module
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop is optional and not available on Windows
+    uvloop = None
+
+if TYPE_CHECKING:
+    from dns_updater import DNSUpdater
 
 # Configure logging
 logging.basicConfig(
@@ -13,14 +31,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def parse_source_list(source_string: str) -> List[str]:
-    """Parse comma-separated source list string into a list"""
+def make_resolver() -> Optional[aiohttp.AsyncResolver]:
+    """Use the c-ares based resolver if aiodns is usable, else aiohttp's threaded default"""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError as e:
+        # aiodns is not installed or does not support the running event loop
+        logger.debug(f"Falling back to default DNS resolver: {e}")
+        return None
+
+def json_serialize(obj) -> str:
+    """Encode a JSON request body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+def make_session(family: int, timeout: aiohttp.ClientTimeout) -> aiohttp.ClientSession:
+    """
+    Create a session whose connections only use the given address family
+    
+    Connections and DNS lookups are reused across update cycles. Lookups go
+    through aiodns when available instead of the executor's getaddrinfo.
+    """
+    connector = aiohttp.TCPConnector(
+        family=family,
+        limit=100,
+        limit_per_host=4,
+        keepalive_timeout=75,
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        resolver=make_resolver()
+    )
+    return aiohttp.ClientSession(
+        connector=connector, 
+        timeout=timeout, 
+        json_serialize=json_serialize
+    )
+
+def parse_list(value: Optional[str], *, lower: bool = True) -> Tuple[str, ...]:
+    """Parse a comma-separated string into a tuple of stripped, non-empty items"""
+    if not value:
+        return ()
+    
+    items = (item.strip() for item in value.split(','))
+    return tuple(item.lower() if lower else item for item in items if item)
+
+def parse_source_list(source_string: str) -> Tuple[str, ...]:
+    """Parse comma-separated source list string into a tuple"""
     if not source_string or source_string.lower() == 'all':
-        return []  # Empty list means use all sources
+        return ()  # Empty tuple means use all sources
     
-    return [s.strip().lower() for s in source_string.split(',') if s.strip()]
+    return parse_list(source_string)
 
-async def main():
+async def main(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser(description='Dynamic DNS Client')
     
     # Required arguments (conditionally required)
@@ -47,12 +110,21 @@ async def main():
                        help='Comma-separated list of IP sources to exclude')
     parser.add_argument('--source-timeout', type=int, default=10,
                        help='Timeout for IP source checking in seconds')
+    parser.add_argument('--source-cache-ttl', type=int, default=900,
+                       help='Seconds to reuse the list of working IP sources before checking them again')
+    parser.add_argument('--source-concurrency', type=int, default=0,
+                       help='Maximum number of IP sources queried at once (0 for no limit)')
+    parser.add_argument('--ip-cache-ttl', type=int, default=None,
+                       help='Seconds to confirm the last detected IP with only the best source '
+                            '(default: min(5 * interval, 300), 0 to always query all sources)')
     
     # Timing configuration
     parser.add_argument('--interval', type=int, default=60, 
                        help='Interval in seconds between checks')
     parser.add_argument('--timeout', type=int, default=30,
                        help='Request timeout in seconds for DNS operations')
+    parser.add_argument('--log-heartbeat', type=int, default=10,
+                       help='Log an unchanged IP only every N checks (0 to only log changes)')
     
     # Validation mode
     parser.add_argument('--validate-only', action='store_true',
@@ -60,7 +132,7 @@ async def main():
     parser.add_argument('--list-sources', action='store_true',
                        help='List all available IP sources and exit')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # If list-sources flag is set, show available sources and exit
     if args.list_sources:
@@ -71,7 +143,10 @@ async def main():
         print("=====================")
         for source in ip_manager.get_working_sources_info():
             print(f"{source['name']} (priority: {source['priority']})")
-        return
+        return 0
+    
+    # Imported here so --help and --list-sources skip loading the providers
+    from dns_updater import DNSUpdater
     
     # Determine IP version(s) to use
     if args.dual_stack:
@@ -81,21 +156,37 @@ async def main():
     else:
         ip_versions = [4]  # Default to IPv4
     
-    # Parse records
-    records = [r.strip() for r in args.records.split(',')]
+    ip_cache_ttl = args.ip_cache_ttl
+    if ip_cache_ttl is None:
+        ip_cache_ttl = min(args.interval * 5, 300)
+    
+    # Parse records; names keep their case because the provider matches
+    # existing records by exact name
+    records = parse_list(args.records, lower=False)
+    if not records:
+        parser.error('--records must name at least one record')
     
     # Parse source lists
     include_sources = parse_source_list(args.sources)
     exclude_sources = parse_source_list(args.exclude_sources)
     
-    # Create TCP connector - use AF_UNSPEC to support both IPv4 and IPv6
-    connector = aiohttp.TCPConnector(family=socket.AF_UNSPEC, limit=10)
     timeout = aiohttp.ClientTimeout(total=args.timeout)
     
-    async with aiohttp.ClientSession(
-        connector=connector, 
-        timeout=timeout
-    ) as session:
+    async with contextlib.AsyncExitStack() as stack:
+        # Provider API calls may use either family (AF_UNSPEC). IP sources get a
+        # session pinned to the family they report, so an IPv4 lookup never
+        # waits on an IPv6 connection attempt and vice versa. Each session is
+        # shared by everything using it for the whole run.
+        session = await stack.enter_async_context(make_session(socket.AF_UNSPEC, timeout))
+        source_sessions = {
+            ip_version: await stack.enter_async_context(
+                make_session(socket.AF_INET if ip_version == 4 else socket.AF_INET6, timeout)
+            )
+            for ip_version in ip_versions
+        }
+        
+        # Provider instances for this run only; they are bound to the session
+        provider_instances = {}
         
         # Create DNS updaters for each IP version
         updaters = []
@@ -106,61 +197,148 @@ async def main():
                 domain=args.domain,
                 records=records,
                 session=session,
+                source_session=source_sessions[ip_version],
                 ip_version=ip_version,
                 source_names=include_sources,
                 exclude_sources=exclude_sources,
-                source_timeout=args.source_timeout
+                source_timeout=args.source_timeout,
+                source_cache_ttl=args.source_cache_ttl,
+                ip_cache_ttl=ip_cache_ttl,
+                source_concurrency=args.source_concurrency,
+                provider_instances=provider_instances
             )
             updaters.append(updater)
         
-        # Validate configuration
+        # Validate configuration, once per provider account and domain; in
+        # dual-stack mode both updaters share the same one
+        unique_updaters = {updater.validation_key: updater for updater in updaters}
         try:
-            for updater in updaters:
-                await updater.validate_domain()
+            await asyncio.gather(*(updater.validate_domain() for updater in unique_updaters.values()))
             logger.info(f"Domain {args.domain} validated with {args.provider} provider")
         except Exception as e:
             logger.error(f"Domain validation failed: {e}")
-            return
+            return 1
         
         # If only validation mode, exit here
         if args.validate_only:
             logger.info("Configuration validated successfully. Exiting.")
-            return
+            return 0
         
         # Start update loop
-        await run_update_loop(updaters, args.interval)
+        try:
+            await run_update_loop(updaters, args.interval, args.log_heartbeat)
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Stopping: provider rejected request ({e.status} {e.message}). Check your configuration.")
+            return 1
+        finally:
+            # Let record updates still in flight finish while the session is open
+            await asyncio.gather(*(updater.wait_pending_update() for updater in updaters))
+    
+    return 0
 
-async def run_update_loop(updaters: List[DNSUpdater], interval: int):
-    """Run the main update loop for all updaters"""
-    # Store current IPs for each updater
-    current_ips = {id(updater): None for updater in updaters}
+async def _tick(
+    updater: 'DNSUpdater', 
+    interval: int, 
+    log_heartbeat: int
+) -> Optional[float]:
+    """
+    Run one check for a single updater
+    
+    Returns:
+        A delay before the next check of this updater if this one failed,
+        otherwise None. Retry delays back off exponentially from 30 seconds
+        up to the larger of the normal interval and 5 minutes, so failing
+        checks never run more often than the exponential schedule allows.
+    
+    Raises:
+        aiohttp.ClientResponseError: for client errors (4xx other than 408/429),
+            which indicate a misconfiguration that retrying will not fix. These
+            only come from rejected credentials (401/403) or from listing the
+            domain's records; a single record that fails to update is logged
+            and retried on a later check.
+    """
+    try:
+        # Surface errors from the previous record update, which ran in the background
+        updater.check_pending_update()
+        
+        # Get current public IP using multi-source system
+        new_ip = await updater.get_current_ip()
+        
+        # Update DNS if IP changed; the update runs while the loop waits for
+        # the next check
+        target_ip = updater.target_ip
+        if new_ip != target_ip:
+            logger.info(f"IPv{updater.ip_version} changed from {target_ip or 'none'} to {new_ip}")
+            updater.reset_unchanged_count()
+            updater.schedule_update(new_ip)
+        elif updater.should_log_unchanged(log_heartbeat):
+            logger.info(f"IPv{updater.ip_version} unchanged: {new_ip}")
+        else:
+            logger.debug(f"IPv{updater.ip_version} unchanged: {new_ip}")
+        
+    except asyncio.TimeoutError:
+        logger.error(f"IPv{updater.ip_version}: Request timed out. Retrying after delay.")
+    except aiohttp.ClientResponseError as e:
+        if 400 <= e.status < 500 and e.status not in (408, 429):
+            logger.error(f"IPv{updater.ip_version}: Request rejected: {e.status} {e.message}")
+            raise
+        logger.error(f"IPv{updater.ip_version}: Server error: {e.status} {e.message}. Retrying after delay.")
+    except aiohttp.ClientError as e:
+        logger.error(f"IPv{updater.ip_version}: Network error: {e}. Retrying after delay.")
+    except Exception as e:
+        logger.error(f"IPv{updater.ip_version}: Error occurred: {e}. Retrying after delay.")
+    else:
+        updater.reset_retry_delay()
+        return None
+    
+    return updater.next_retry_delay(max_delay=max(interval, 300))
+
+async def _run_updater(updater: 'DNSUpdater', interval: int, log_heartbeat: int) -> None:
+    """Check a single updater on its own schedule until a non-retryable error occurs"""
+    # Checks are scheduled against fixed deadlines so the time spent in a
+    # check does not push every later check back
+    deadline = time.monotonic()
     
     while True:
-        for updater in updaters:
-            try:
-                # Get current public IP using multi-source system
-                new_ip = await updater.get_current_ip()
-                
-                # Update DNS if IP changed
-                if new_ip != current_ips[id(updater)]:
-                    logger.info(f"IPv{updater.ip_version} changed from {current_ips[id(updater)] or 'none'} to {new_ip}")
-                    current_ips[id(updater)] = new_ip
-                    await updater.update_dns_records(new_ip)
-                else:
-                    logger.info(f"IPv{updater.ip_version} unchanged: {current_ips[id(updater)]}")
-                
-            except asyncio.TimeoutError:
-                logger.error(f"IPv{updater.ip_version}: Request timed out. Retrying after delay.")
-                await asyncio.sleep(min(interval, 30))
-            except aiohttp.ClientError as e:
-                logger.error(f"IPv{updater.ip_version}: Network error: {e}. Retrying after delay.")
-                await asyncio.sleep(min(interval, 30))
-            except Exception as e:
-                logger.error(f"IPv{updater.ip_version}: Error occurred: {e}. Retrying after delay.")
-                await asyncio.sleep(min(interval, 60))
+        retry_delay = await _tick(updater, interval, log_heartbeat)
+        
+        # Wait for next check, or for the retry delay if this check failed
+        deadline += interval if retry_delay is None else retry_delay
+        
+        now = time.monotonic()
+        if now - deadline > interval / 2:
+            # Checks are not keeping up; start over from now instead of
+            # running the missed ones back to back
+            logger.warning(f"IPv{updater.ip_version} check overran its schedule by {now - deadline:.1f}s")
+            deadline = now
         
-        # Wait for next check
-        await asyncio.sleep(interval)
+        await asyncio.sleep(max(0, deadline - now))
+
+async def run_update_loop(updaters: List['DNSUpdater'], interval: int, log_heartbeat: int = 10):
+    """Run the main update loop for all updaters until a non-retryable error occurs"""
+    # Each updater keeps its own deadline, so one backing off after failures
+    # does not change how often the others are checked
+    tasks = [
+        asyncio.ensure_future(_run_updater(updater, interval, log_heartbeat))
+        for updater in updaters
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Stop on errors that retrying will not fix
+    for task in done:
+        task.result()
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Parse the given arguments and run the client, returning an exit code"""
+    # Prefer uvloop's libuv based event loop when installed
+    if uvloop is not None:
+        return uvloop.run(main(argv))
+    return asyncio.run(main(argv))
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(run())
\ No newline at end of file
@@ -1,3 +1,7 @@
+import aiohttp
+from functools import lru_cache
+from typing import Dict, Tuple
+from .base_provider import DNSProvider, api_key_hash
 from .arvan_provider import ArvanProvider
 
 # Map provider names to their implementation classes
@@ -6,9 +10,32 @@ PROVIDERS = {
     # Add other providers here: 'cloudflare': CloudflareProvider, etc.
 }
 
+@lru_cache(maxsize=None)
 def get_provider(provider_name: str):
-    """Get provider class by name"""
+    """Get provider class by name (cached; returns the class, not an instance)"""
     provider_class = PROVIDERS.get(provider_name.lower())
     if not provider_class:
         raise ValueError(f"Unsupported provider: {provider_name}")
-    return provider_class
\ No newline at end of file
+    return provider_class
+
+def get_provider_instance(
+    provider_name: str, 
+    api_key: str, 
+    session: aiohttp.ClientSession, 
+    instances: Dict[Tuple[str, str], DNSProvider]
+) -> DNSProvider:
+    """
+    Get the provider instance for an account, creating it on first use
+    
+    Args:
+        instances: Registry of instances keyed by (provider class name, API key
+            hash). It is owned by the caller and must not outlive the session,
+            which is only used when an instance is created.
+    """
+    provider_class = get_provider(provider_name)
+    key = (provider_class.__name__, api_key_hash(api_key))
+    
+    instance = instances.get(key)
+    if instance is None:
+        instance = instances[key] = provider_class(api_key, session)
+    return instance
\ No newline at end of file
@@ -1,7 +1,8 @@
 import asyncio
 import aiohttp
 import logging
-from .base_provider import DNSProvider
+from typing import Dict, List, Optional
+from .base_provider import DNSProvider, json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +10,10 @@ class ArvanProvider(DNSProvider):
     BASE_URL = "https://napi.arvancloud.ir/cdn/4.0"
     DEFAULT_TIMEOUT = 30  # seconds
     
-    def _get_headers(self) -> dict:
-        return {
+    def __init__(self, api_key: str, session: aiohttp.ClientSession):
+        super().__init__(api_key, session)
+        # Built once; the same headers are sent with every request
+        self._headers = {
             "Authorization": f"Apikey {self.api_key}",
             "Content-Type": "application/json",
             "Accept": "application/json"
@@ -19,7 +22,7 @@ class ArvanProvider(DNSProvider):
     async def validate_domain(self, domain: str) -> None:
         """Validate domain exists in ArvanCloud account"""
         url = f"{self.BASE_URL}/domains/{domain}"
-        async with self.session.get(url, headers=self._get_headers()) as response:
+        async with self.session.get(url, headers=self._headers) as response:
             if response.status == 404:
                 raise ValueError(f"Domain '{domain}' not found in your ArvanCloud account")
             response.raise_for_status()
@@ -32,6 +35,60 @@ class ArvanProvider(DNSProvider):
         new_ip: str
     ) -> None:
         """Update or create DNS record in ArvanCloud"""
+        (result,) = await self.update_dns_records(domain, [record], record_type, new_ip)
+        if result is not None:
+            raise result
+    
+    async def update_dns_records(
+        self, 
+        domain: str, 
+        records: List[str], 
+        record_type: str, 
+        new_ip: str
+    ) -> List[Optional[BaseException]]:
+        """
+        Update or create DNS records in ArvanCloud, listing existing records only once
+        
+        Returns:
+            One entry per record: None on success, otherwise the raised exception
+        
+        Raises:
+            Errors listing the existing records, since no record can be written
+            without the listing
+        """
+        record_ids = await self._get_record_ids(domain, record_type)
+        
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_UPDATES)
+        
+        async def write(record: str) -> None:
+            async with semaphore:
+                await self._write_record(domain, record, record_type, new_ip, record_ids.get(record))
+        
+        return await asyncio.gather(*(write(record) for record in records), return_exceptions=True)
+    
+    async def _get_record_ids(self, domain: str, record_type: str) -> Dict[str, str]:
+        """Map record names of the given type to their ArvanCloud record IDs"""
+        records_url = f"{self.BASE_URL}/domains/{domain}/dns-records"
+        async with self.session.get(records_url, headers=self._headers) as response:
+            response.raise_for_status()
+            records = await response.json(loads=json_loads)
+        
+        record_ids = {}
+        for r in records["data"]:
+            if r["type"] == record_type:
+                # Keep the first matching record, as before
+                record_ids.setdefault(r["name"], r["id"])
+        return record_ids
+    
+    async def _write_record(
+        self, 
+        domain: str, 
+        record: str, 
+        record_type: str, 
+        new_ip: str, 
+        record_id: Optional[str]
+    ) -> None:
+        """Update the record with the given ID, or create it if there is none"""
         # Prepare record data
         record_data = {
             "type": record_type,
@@ -47,43 +104,22 @@ class ArvanProvider(DNSProvider):
             }
         }
         
-        try:
-            # Get existing records
+        # Update or create record
+        if record_id:
+            update_url = f"{self.BASE_URL}/domains/{domain}/dns-records/{record_id}"
+            async with self.session.put(
+                update_url, 
+                headers=self._headers, 
+                json=record_data
+            ) as response:
+                response.raise_for_status()
+            logger.info(f"Updated DNS record {record}.{domain} with IP {new_ip}")
+        else:
             records_url = f"{self.BASE_URL}/domains/{domain}/dns-records"
-            async with self.session.get(records_url, headers=self._get_headers()) as response:
+            async with self.session.post(
+                records_url, 
+                headers=self._headers, 
+                json=record_data
+            ) as response:
                 response.raise_for_status()
-                records = await response.json()
-            
-            record_id = None
-            
-            # Find matching record
-            for r in records["data"]:
-                if r["name"] == record and r["type"] == record_type:
-                    record_id = r["id"]
-                    break
-            
-            # Update or create record
-            if record_id:
-                update_url = f"{self.BASE_URL}/domains/{domain}/dns-records/{record_id}"
-                async with self.session.put(
-                    update_url, 
-                    headers=self._get_headers(), 
-                    json=record_data
-                ) as response:
-                    response.raise_for_status()
-                logger.info(f"Updated DNS record {record}.{domain} with IP {new_ip}")
-            else:
-                async with self.session.post(
-                    records_url, 
-                    headers=self._get_headers(), 
-                    json=record_data
-                ) as response:
-                    response.raise_for_status()
-                logger.info(f"Created DNS record {record}.{domain} with IP {new_ip}")
-                
-        except aiohttp.ClientResponseError as e:
-            logger.error(f"Failed to update record {record}: {e.status} {e.message}")
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout updating record {record}")
-        except Exception as e:
-            logger.error(f"Error updating record {record}: {str(e)}")
\ No newline at end of file
+            logger.info(f"Created DNS record {record}.{domain} with IP {new_ip}")
\ No newline at end of file
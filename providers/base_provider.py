@@ -1,9 +1,32 @@
 import aiohttp
-import ipaddress
+import hashlib
 import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the standard library parser
+    orjson = None
+
+# Parser for provider API responses: await response.json(loads=json_loads)
+json_loads = orjson.loads if orjson is not None else json.loads
+
+def api_key_hash(api_key: str) -> str:
+    """Short digest identifying an API key, so caches do not keep raw secrets around"""
+    return hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
 
 class DNSProvider(ABC):
+    VALIDATION_TTL = 600  # seconds
+    MAX_CONCURRENT_UPDATES = 4  # parallel record updates per batch
+    
+    # Successful domain validations shared by all provider instances, keyed by
+    # (provider class, API key hash, domain) -> monotonic time of validation
+    _validation_cache: Dict[Tuple[str, str, str], float] = {}
+    
     def __init__(self, api_key: str, session: aiohttp.ClientSession):
         self.api_key = api_key
         self.session = session
@@ -13,6 +36,21 @@ class DNSProvider(ABC):
         """Validate the domain exists with the provider"""
         pass
     
+    def validation_cache_key(self, domain: str) -> Tuple[str, str, str]:
+        """Key under which a successful validation of the domain is cached"""
+        return (type(self).__name__, api_key_hash(self.api_key), domain)
+    
+    async def validate_domain_cached(self, domain: str) -> None:
+        """Validate the domain, skipping the API call if it was validated recently"""
+        cache_key = self.validation_cache_key(domain)
+        
+        validated_at = self._validation_cache.get(cache_key)
+        if validated_at is not None and time.monotonic() - validated_at < self.VALIDATION_TTL:
+            return
+        
+        await self.validate_domain(domain)
+        self._validation_cache[cache_key] = time.monotonic()
+    
     @abstractmethod
     async def update_dns_record(
         self, 
@@ -22,4 +60,30 @@ class DNSProvider(ABC):
         new_ip: str
     ) -> None:
         """Update the DNS record with the new IP"""
-        pass
\ No newline at end of file
+        pass
+    
+    async def update_dns_records(
+        self, 
+        domain: str, 
+        records: List[str], 
+        record_type: str, 
+        new_ip: str
+    ) -> List[Optional[BaseException]]:
+        """
+        Update several DNS records concurrently with the new IP
+        
+        Returns:
+            One entry per record: None on success, otherwise the raised exception
+        
+        Raises:
+            Errors that prevent the whole batch, as opposed to a single record;
+            providers overriding this method raise them instead of returning
+            them for every record
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_UPDATES)
+        
+        async def update(record: str) -> None:
+            async with semaphore:
+                await self.update_dns_record(domain, record, record_type, new_ip)
+        
+        return await asyncio.gather(*(update(record) for record in records), return_exceptions=True)
\ No newline at end of file